@@ -5,6 +5,7 @@
 import os
 import re
 import sys
+from functools import partial
 
 
 # TODO make this less brittle
@@ -133,9 +134,7 @@ _hex_colors_src = re.compile(
 _hex_colors_dst = r"""<span class="s2">&quot;0x\g<hex>&quot;</span><span class="m-code-color" style="background-color: #\g<hex>;"></span>"""
 
 M_CODE_FILTERS_POST = {
-    ("Python", "string_hex_colors"): lambda code: _hex_colors_src.sub(
-        _hex_colors_dst, code
-    )
+    ("Python", "string_hex_colors"): partial(_hex_colors_src.sub, _hex_colors_dst)
 }
 
 M_DOX_TAGFILES = [
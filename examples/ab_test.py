@@ -118,11 +118,12 @@ def print_metric(
     comparison_label_generator=None,
     metric_transformer=None,
 ):
+    # the column titles are the same for every process count
+    title = "Resolution".ljust(16)
+    title += "".join(t.ljust(24) for t in title_list)
     for nproc, performance in performance_all.items():
         header = f" Performance ({metric}) NPROC={nproc} "
         print(f"{header:=^100}")
-        title = "Resolution".ljust(16)
-        title += "".join(t.ljust(24) for t in title_list)
         print(title)
         # break down by resolutions
         for resolution, perf in zip(resolutions, performance):
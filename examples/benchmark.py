@@ -126,15 +126,14 @@ if __name__ == "__main__":
 
         performance_all[nprocs] = performance
 
+    # the column titles are the same for every table, so build them once
+    title = "Resolution " + "".join("\t%-10s" % key for key in benchmark_items)
     for nproc, performance in performance_all.items():
         print(
             " ================ Performance (FPS) NPROC={} ===================================".format(
                 nproc
             )
         )
-        title = "Resolution "
-        for key in perf:
-            title += "\t%-10s" % key
         print(title)
         for idx in range(len(performance)):
             row = "%d x %d" % (resolutions[idx], resolutions[idx])
@@ -152,9 +151,6 @@ if __name__ == "__main__":
                     nproc
                 )
             )
-            title = "Resolution "
-            for key in perf:
-                title += "\t%-10s" % key
             print(title)
             for idx in range(len(performance)):
                 row = "%d x %d" % (resolutions[idx], resolutions[idx])
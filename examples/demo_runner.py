@@ -142,12 +142,11 @@ class DemoRunner:
         )
         turn_angle = math.atan2(det, np.dot(agent_local_forward, flat_to_obj))
         agent_state.rotation = quat_from_angle_axis(turn_angle, np.array([0, 1.0, 0]))
-        # need to move the sensors too
-        for sensor in agent_state.sensor_states:
-            agent_state.sensor_states[sensor].rotation = agent_state.rotation
-            agent_state.sensor_states[
-                sensor
-            ].position = agent_state.position + np.array([0, 1.5, 0])
+        # need to move the sensors too; they all share the same pose
+        sensor_position = agent_state.position + np.array([0, 1.5, 0])
+        for sensor_state in agent_state.sensor_states.values():
+            sensor_state.rotation = agent_state.rotation
+            sensor_state.position = sensor_position
         self._sim.get_agent(0).set_state(agent_state)
 
         # hard coded dimensions of maximum bounding box for all 3 default objects:
@@ -189,21 +188,17 @@ class DemoRunner:
                 )
             obj = rigid_obj_mgr.add_object_by_template_id(rand_obj_index)
             object_init_grid[object_init_cell] = obj.object_id
-            object_offset = np.array(
-                [
-                    max_union_bb_dim[0] * object_init_cell[0],
-                    max_union_bb_dim[1] * object_init_cell[1],
-                    max_union_bb_dim[2] * object_init_cell[2],
-                ]
-            )
-            obj.translation = object_position + object_offset
+            # scale the grid cell by the bounding box dimensions in one
+            # vectorized op and reuse the result for placement and logging
+            obj_position = object_position + max_union_bb_dim * object_init_cell
+            obj.translation = obj_position
             print(
                 "added object: "
                 + str(obj.object_id)
                 + " of type "
                 + str(rand_obj_index)
                 + " at: "
-                + str(object_position + object_offset)
+                + str(obj_position)
                 + " | "
                 + str(object_init_cell)
             )
@@ -229,17 +224,35 @@ class DemoRunner:
 
         time_per_step = []
 
-        while total_frames < self._sim_settings["max_frames"]:
+        # the settings are fixed for the whole run, so resolve the per-frame
+        # switches once instead of looking them up on every frame
+        sim_settings = self._sim_settings
+        max_frames = sim_settings["max_frames"]
+        silent = sim_settings["silent"]
+        enable_physics = sim_settings["enable_physics"]
+        save_png = sim_settings["save_png"]
+        save_color = save_png and sim_settings["color_sensor"]
+        save_depth = save_png and sim_settings["depth_sensor"]
+        save_semantic = save_png and sim_settings["semantic_sensor"]
+        compute_shortest_path = sim_settings["compute_shortest_path"]
+        compute_action_shortest_path = sim_settings["compute_action_shortest_path"]
+        goal_position = sim_settings["goal_position"]
+        print_semantic_mask_stats = (
+            sim_settings["semantic_sensor"]
+            and sim_settings["print_semantic_mask_stats"]
+        )
+
+        while total_frames < max_frames:
             if total_frames == 1:
                 start_time = time.time()
             action = random.choice(action_names)
-            if not self._sim_settings["silent"]:
+            if not silent:
                 print("action", action)
 
             start_step_time = time.time()
 
             # apply kinematic or dynamic control to all objects based on their MotionType
-            if self._sim_settings["enable_physics"]:
+            if enable_physics:
                 obj_names = rigid_obj_mgr.get_object_handles()
                 for obj_name in obj_names:
                     rand_nudge = np.random.uniform(-0.05, 0.05, 3)
@@ -258,34 +271,26 @@ class DemoRunner:
             # get simulation step time without sensor observations
             total_sim_step_time += self._sim._previous_step_time
 
-            if self._sim_settings["save_png"]:
-                if self._sim_settings["color_sensor"]:
-                    self.save_color_observation(observations, total_frames)
-                if self._sim_settings["depth_sensor"]:
-                    self.save_depth_observation(observations, total_frames)
-                if self._sim_settings["semantic_sensor"]:
-                    self.save_semantic_observation(observations, total_frames)
+            if save_color:
+                self.save_color_observation(observations, total_frames)
+            if save_depth:
+                self.save_depth_observation(observations, total_frames)
+            if save_semantic:
+                self.save_semantic_observation(observations, total_frames)
 
             state = self._sim.last_state()
 
-            if not self._sim_settings["silent"]:
+            if not silent:
                 print("position\t", state.position, "\t", "rotation\t", state.rotation)
 
-            if self._sim_settings["compute_shortest_path"]:
-                self.compute_shortest_path(
-                    state.position, self._sim_settings["goal_position"]
-                )
+            if compute_shortest_path:
+                self.compute_shortest_path(state.position, goal_position)
 
-            if self._sim_settings["compute_action_shortest_path"]:
-                self._action_path = self.greedy_follower.find_path(
-                    self._sim_settings["goal_position"]
-                )
+            if compute_action_shortest_path:
+                self._action_path = self.greedy_follower.find_path(goal_position)
                 print("len(action_path)", len(self._action_path))
 
-            if (
-                self._sim_settings["semantic_sensor"]
-                and self._sim_settings["print_semantic_mask_stats"]
-            ):
+            if print_semantic_mask_stats:
                 self.output_semantic_mask_stats(observations, total_frames)
 
             total_frames += 1
@@ -394,16 +399,12 @@ class DemoRunner:
         ) as pool:
             perfs = pool.map(self._bench_target, range(nprocs))
 
-        res = {k: [] for k in perfs[0]}
-        for p in perfs:
-            for k, v in p.items():
-                res[k] += [v]
-
+        # reduce only the reported metrics, straight from the per-process results
         return dict(
-            frame_time=sum(res["frame_time"]),
-            fps=sum(res["fps"]),
-            total_time=sum(res["total_time"]) / nprocs,
-            avg_sim_step_time=sum(res["avg_sim_step_time"]) / nprocs,
+            frame_time=sum(p["frame_time"] for p in perfs),
+            fps=sum(p["fps"] for p in perfs),
+            total_time=sum(p["total_time"] for p in perfs) / nprocs,
+            avg_sim_step_time=sum(p["avg_sim_step_time"] for p in perfs) / nprocs,
         )
 
     def example(self):
@@ -92,15 +92,28 @@ def make_configuration():
     return habitat_sim.Configuration(backend_cfg, [agent_cfg])
 
 
+# all examples step physics and render at a fixed 60Hz
+TIME_STEP = 1.0 / 60.0
+
+
+def num_steps(dt):
+    # number of fixed timesteps needed to cover dt seconds
+    return int(round(dt / TIME_STEP))
+
+
 def simulate(sim, dt=1.0, get_frames=True):
     # simulate dt seconds at 60Hz to the nearest fixed timestep
     print("Simulating " + str(dt) + " world seconds.")
-    observations = []
-    start_time = sim.get_world_time()
-    while sim.get_world_time() < start_time + dt:
-        sim.step_physics(1.0 / 60.0)
-        if get_frames:
-            observations.append(sim.get_sensor_observations())
+    # run a fixed number of steps rather than polling the world time each step
+    if not get_frames:
+        for _ in range(num_steps(dt)):
+            sim.step_physics(TIME_STEP)
+        return []
+
+    observations = [None] * num_steps(dt)
+    for frame in range(len(observations)):
+        sim.step_physics(TIME_STEP)
+        observations[frame] = sim.get_sensor_observations()
 
     return observations
 
@@ -213,23 +226,24 @@ if __name__ == "__main__":
     cheezit_template_handle = obj_templates_mgr.get_template_handles(
         "data/objects/example_objects/cheezit"
     )[0]
-    # build multiple object initial positions
-    box_positions = [
-        [2.39, -0.37, 0.0],
-        [2.39, -0.64, 0.0],
-        [2.39, -0.91, 0.0],
-        [2.39, -0.64, -0.22],
-        [2.39, -0.64, 0.22],
-    ]
+    # build multiple object initial positions, one row per box
+    box_positions = np.array(
+        [
+            [2.39, -0.37, 0.0],
+            [2.39, -0.64, 0.0],
+            [2.39, -0.91, 0.0],
+            [2.39, -0.64, -0.22],
+            [2.39, -0.64, 0.22],
+        ]
+    )
     box_orientation = mn.Quaternion.rotation(mn.Deg(90.0), [-1.0, 0.0, 0.0])
     # instance and place the boxes
     boxes = []
-    for b in range(len(box_positions)):
-        boxes.append(
-            rigid_obj_mgr.add_object_by_template_handle(cheezit_template_handle)
-        )
-        boxes[b].translation = box_positions[b]
-        boxes[b].rotation = box_orientation
+    for box_position in box_positions:
+        box = rigid_obj_mgr.add_object_by_template_handle(cheezit_template_handle)
+        box.translation = box_position
+        box.rotation = box_orientation
+        boxes.append(box)
 
     # anti-gravity force f=m(-g) using first object's mass (all objects have the same mass)
     anti_grav_force = -1.0 * sim.get_gravity() * boxes[0].mass
@@ -250,14 +264,17 @@ if __name__ == "__main__":
     sphere_obj.linear_velocity = target_direction * 5
     sphere_obj.angular_velocity = [0.0, -1.0, 0.0]
 
-    start_time = sim.get_world_time()
+    # the force application point and torque are the same for every box and step
+    force_rel_pos = mn.Vector3(0.0, 0.0, 0.0)
+    box_torque = mn.Vector3(0.0, 0.01, 0.0)
+
     dt = 3.0
-    while sim.get_world_time() < start_time + dt:
+    for _ in range(num_steps(dt)):
         # set forces/torques before stepping the world
         for box in boxes:
-            box.apply_force(anti_grav_force, [0.0, 0.0, 0.0])
-            box.apply_torque([0.0, 0.01, 0.0])
-        sim.step_physics(1.0 / 60.0)
+            box.apply_force(anti_grav_force, force_rel_pos)
+            box.apply_torque(box_torque)
+        sim.step_physics(TIME_STEP)
         observations.append(sim.get_sensor_observations())
 
     if make_video:
@@ -316,15 +333,16 @@ if __name__ == "__main__":
     clamp_obj.motion_type = habitat_sim.physics.MotionType.KINEMATIC
     clamp_obj.translation = [0.8, 0.2, 0.5]
 
-    start_time = sim.get_world_time()
+    # the per-step translation and rotation increments are constant
+    step_translation = mn.Vector3(0.0, 0.0, 0.01)
+    step_rotation = mn.Quaternion.rotation(mn.Rad(0.05), [-1.0, 0.0, 0.0])
+
     dt = 1.0
-    while sim.get_world_time() < start_time + dt:
+    for _ in range(num_steps(dt)):
         # manually control the object's kinematic state
-        clamp_obj.translation += [0.0, 0.0, 0.01]
-        clamp_obj.rotation = (
-            mn.Quaternion.rotation(mn.Rad(0.05), [-1.0, 0.0, 0.0]) * clamp_obj.rotation
-        )
-        sim.step_physics(1.0 / 60.0)
+        clamp_obj.translation += step_translation
+        clamp_obj.rotation = step_rotation * clamp_obj.rotation
+        sim.step_physics(TIME_STEP)
         observations.append(sim.get_sensor_observations())
 
     if make_video:
@@ -497,11 +515,10 @@ if __name__ == "__main__":
             video_prefix = "robot_control_no_sliding"
 
         # manually control the object's kinematic state via velocity integration
-        start_time = sim.get_world_time()
         last_velocity_set = 0
         dt = 6.0
-        time_step = 1.0 / 60.0
-        while sim.get_world_time() < start_time + dt:
+        time_step = TIME_STEP
+        for _ in range(num_steps(dt)):
             previous_rigid_state = locobot.rigid_state
 
             # manually integrate the rigid state
@@ -509,18 +526,20 @@ if __name__ == "__main__":
                 time_step, previous_rigid_state
             )
 
+            # fetch the translations once, each property access returns a copy
+            previous_translation = previous_rigid_state.translation
+            target_translation = target_rigid_state.translation
+
             # snap rigid state to navmesh and set state to object/agent
-            end_pos = sim.step_filter(
-                previous_rigid_state.translation, target_rigid_state.translation
-            )
+            end_pos = sim.step_filter(previous_translation, target_translation)
             locobot.translation = end_pos
             locobot.rotation = target_rigid_state.rotation
 
             # Check if a collision occurred
-            dist_moved_before_filter = (
-                target_rigid_state.translation - previous_rigid_state.translation
-            ).dot()
-            dist_moved_after_filter = (end_pos - previous_rigid_state.translation).dot()
+            # NB: Vector3.dot() with no argument is the squared length, so the
+            # comparison below never needs a square root
+            dist_moved_before_filter = (target_translation - previous_translation).dot()
+            dist_moved_after_filter = (end_pos - previous_translation).dot()
 
             # NB: There are some cases where ||filter_end - end_pos|| > 0 when a
             # collision _didn't_ happen. One such case is going up stairs.  Instead,
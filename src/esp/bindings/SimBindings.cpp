@@ -261,6 +261,10 @@ void initSimBindings(py::module& m) {
       .def(
           "step_world", &Simulator::stepWorld, "dt"_a = 1.0 / 60.0,
           R"(Step the physics simulation by a desired timestep (dt). Note that resulting world time after step may not be exactly t+dt. Use get_world_time to query current simulation time.)")
+      .def(
+          "step_world_until", &Simulator::stepWorldUntil, "target_time"_a,
+          "dt"_a = 1.0 / 60.0,
+          R"(Repeatedly step the physics simulation by dt until the world time reaches target_time, without returning to Python between steps. Returns the resulting world time.)")
       .def("get_world_time", &Simulator::getWorldTime,
            R"(Query the current simulation world time.)")
       .def("get_physics_time_step", &Simulator::getPhysicsTimeStep,
@@ -4,6 +4,7 @@
 
 #include "Simulator.h"
 
+#include <cmath>
 #include <memory>
 #include <string>
 #include <utility>
@@ -814,6 +815,28 @@ double Simulator::stepWorld(const double dt) {
   return getWorldTime();
 }
 
+double Simulator::stepWorldUntil(const double targetTime, const double dt) {
+  if (physicsManager_ == nullptr) {
+    // no physics, so the world time can never advance
+    return getWorldTime();
+  }
+  const double fixedTimeStep = physicsManager_->getTimestep();
+  const double stepDt = dt > 0 ? dt : fixedTimeStep;
+  const double worldTime = getWorldTime();
+  // Bullet only advances the world time in whole fixed timesteps, so a single
+  // stepWorld(dt) with dt smaller than the fixed timestep may leave it
+  // unchanged. Bound the loop by the number of dt steps covering the remaining
+  // time plus one fixed timestep of quantization instead of stopping on the
+  // first step that does not advance. The bound stays a double so that a large
+  // targetTime or a tiny dt cannot overflow an integer conversion.
+  const double maxSteps =
+      std::ceil((targetTime - worldTime + fixedTimeStep) / stepDt) + 1;
+  for (int64_t i = 0; i < maxSteps && getWorldTime() < targetTime; ++i) {
+    stepWorld(stepDt);
+  }
+  return getWorldTime();
+}
+
 // get the simulated world time (0 if no physics enabled)
 double Simulator::getWorldTime() {
   if (physicsManager_ != nullptr) {
@@ -425,6 +425,22 @@ class Simulator {
    */
   double stepWorld(double dt = 1.0 / 60.0);
 
+  /**
+   * @brief Repeatedly step the physical world by @p dt until the world time
+   * reaches @p targetTime. Equivalent to calling @ref stepWorld in a loop, but
+   * keeps the loop on the C++ side. Returns immediately if there is no @ref
+   * esp::physics::PhysicsManager, and never takes more steps than needed to
+   * cover the remaining time plus one fixed physics timestep. The step bound
+   * is computed in floating point, so any @p targetTime and @p dt are accepted;
+   * a very large step count simply takes correspondingly long to run.
+   * @param targetTime The world time to advance the physical world to.
+   * @param dt The duration of each individual @ref stepWorld call. If not
+   * positive, the physics manager's fixed timestep is used.
+   * @return The new world time after stepping. See @ref
+   * esp::physics::PhysicsManager::worldTime_.
+   */
+  double stepWorldUntil(double targetTime, double dt = 1.0 / 60.0);
+
   /**
    * @brief Get the current time in the simulated world. This is always 0 if no
    * @ref esp::physics::PhysicsManager is initialized. See @ref stepWorld. See
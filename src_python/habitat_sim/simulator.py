@@ -541,6 +541,9 @@ class Simulator(SimulatorBackend):
     def step_physics(self, dt: float) -> None:
         self.step_world(dt)
 
+    def step_physics_until(self, target_time: float, dt: float) -> float:
+        return self.step_world_until(target_time, dt)
+
 
 class Sensor:
     r"""Wrapper around habitat_sim.Sensor
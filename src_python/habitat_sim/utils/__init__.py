@@ -10,9 +10,17 @@
 # fixed
 
 
-from habitat_sim.utils import common, manager_utils, settings, validators, viz_utils
+import importlib
+from typing import Any
+
+from habitat_sim.utils import common, manager_utils, validators
 from habitat_sim.utils.common import quat_from_angle_axis, quat_rotate_vector
 
+# viz_utils pulls in imageio, PIL and tqdm, which are only needed for making
+# videos, and settings (default_sim_settings, make_cfg) is only needed by
+# configuration code, so both are imported on first attribute access instead
+_LAZY_SUBMODULES = {"settings", "viz_utils"}
+
 __all__ = [
     "quat_from_angle_axis",
     "quat_rotate_vector",
@@ -21,3 +29,11 @@ __all__ = [
     "validators",
     "settings",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
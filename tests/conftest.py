@@ -21,8 +21,8 @@ _test_scene = osp.abspath(
 
 
 # Testing configurations
-@pytest.fixture(scope="function")
-def make_cfg_settings():
+@pytest.fixture(scope="session")
+def _cfg_settings_template():
     import habitat_sim.utils.settings
 
     cfg = habitat_sim.utils.settings.default_sim_settings.copy()
@@ -38,6 +38,12 @@ def make_cfg_settings():
     return cfg
 
 
+@pytest.fixture(scope="function")
+def make_cfg_settings(_cfg_settings_template):
+    # tests mutate their settings in place, so each one gets its own shallow copy
+    return _cfg_settings_template.copy()
+
+
 def pytest_report_header(config):
     del config  # unused
     output = ["C++ Build Info:"]
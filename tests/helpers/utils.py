@@ -2,10 +2,15 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import math
 import multiprocessing
 import runpy
 import sys
 from os import path as osp
+from typing import Tuple
+
+import numba
+import numpy as np
 
 
 def run_main(*args):
@@ -33,10 +38,34 @@ def run_main_subproc(args):
 
 def simulate(sim, dt, get_observations=False):
     r"""Runs physics simulation at 60FPS for a given duration (dt) optionally collecting and returning sensor observations."""
-    observations = []
     target_time = sim.get_world_time() + dt
+    if not get_observations:
+        # nothing to do between steps, so let the C++ side run the loop
+        sim.step_physics_until(target_time, 1.0 / 60.0)
+        return []
+    observations = []
     while sim.get_world_time() < target_time:
         sim.step_physics(1.0 / 60.0)
-        if get_observations:
-            observations.append(sim.get_sensor_observations())
+        observations.append(sim.get_sensor_observations())
     return observations
+
+
+@numba.jit(nopython=True, fastmath=True, cache=True)
+def _diff_and_ref_norms(obs, gt):
+    diff_sq = 0.0
+    gt_sq = 0.0
+    for j in range(obs.shape[0]):
+        for i in range(obs.shape[1]):
+            ref = float(gt[j, i])
+            diff = float(obs[j, i]) - ref
+            diff_sq += diff * diff
+            gt_sq += ref * ref
+    return math.sqrt(diff_sq), math.sqrt(gt_sq)
+
+
+def diff_and_ref_norms(obs: np.ndarray, gt: np.ndarray) -> Tuple[float, float]:
+    r"""Computes the L2 norms of (obs - gt) and of gt in a single pass over both images, without materializing float copies of either."""
+    assert obs.shape == gt.shape
+    return _diff_and_ref_norms(
+        obs.reshape(obs.shape[0], -1), gt.reshape(gt.shape[0], -1)
+    )
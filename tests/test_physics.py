@@ -11,7 +11,6 @@ from os import path as osp
 import magnum as mn
 import numpy as np
 import pytest
-import quaternion
 
 import habitat_sim
 import habitat_sim.bindings
@@ -26,6 +25,22 @@ from habitat_sim.utils.common import (
 from utils import simulate
 
 
+def rotation_transform_from_quat(q):
+    r"""Constructs the 4x4 transformation matrix of a pure rotation directly from the components of a unit quaternion.
+
+    :param q: A unit quaternion.quaternion
+    """
+    w, x, y, z = q.w, q.x, q.y, q.z
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w), 0],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w), 0],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y), 0],
+            [0, 0, 0, 1],
+        ]
+    )
+
+
 @pytest.mark.skipif(
     not osp.exists("data/scene_datasets/habitat-test-scenes/skokloster-castle.glb")
     or not osp.exists("data/objects/example_objects/"),
@@ -91,8 +106,7 @@ def test_kinematics():
 
         # test get and set rotation
         Q = quat_from_angle_axis(np.pi, np.array([0.0, 1.0, 0.0]))
-        expected = np.eye(4)
-        expected[0:3, 0:3] = quaternion.as_rotation_matrix(Q)
+        expected = rotation_transform_from_quat(Q)
         cheezit_box.rotation = quat_to_magnum(Q)
         assert np.allclose(cheezit_box.transformation, expected)
         assert np.allclose(quat_from_magnum(cheezit_box.rotation), Q)
@@ -106,12 +120,15 @@ def test_kinematics():
         cheezit_box = rigid_obj_mgr.add_object_by_template_handle(obj_handle_list[0])
 
         prev_time = 0.0
-        for _ in range(2):
+        # draw the random translations and actions for all steps up front
+        translations = np.random.rand(2, 3).astype(np.float32)
+        actions = random.choices(tuple(hab_cfg.agents[0].action_space.keys()), k=2)
+        for step in range(2):
             # do some kinematics here (todo: translating or rotating instead of absolute)
-            cheezit_box.translation = np.random.rand(3)
+            cheezit_box.translation = translations[step]
 
             # test getting observation
-            sim.step(random.choice(list(hab_cfg.agents[0].action_space.keys())))
+            sim.step(actions[step])
 
             # check that time is increasing in the world
             assert sim.get_world_time() > prev_time
@@ -213,8 +230,7 @@ def test_kinematics_no_physics():
 
         # test get and set rotation
         Q = quat_from_angle_axis(np.pi, np.array([0.0, 1.0, 0.0]))
-        expected = np.eye(4)
-        expected[0:3, 0:3] = quaternion.as_rotation_matrix(Q)
+        expected = rotation_transform_from_quat(Q)
         cheezit_box.rotation = quat_to_magnum(Q)
         assert np.allclose(cheezit_box.transformation, expected)
         assert np.allclose(quat_from_magnum(cheezit_box.rotation), Q)
@@ -228,12 +244,15 @@ def test_kinematics_no_physics():
         cheezit_box = rigid_obj_mgr.add_object_by_template_handle(obj_handle_list[0])
 
         prev_time = 0.0
-        for _ in range(2):
+        # draw the random translations and actions for all steps up front
+        translations = np.random.rand(2, 3).astype(np.float32)
+        actions = random.choices(tuple(hab_cfg.agents[0].action_space.keys()), k=2)
+        for step in range(2):
             # do some kinematics here (todo: translating or rotating instead of absolute)
-            cheezit_box.translation = np.random.rand(3)
+            cheezit_box.translation = translations[step]
 
             # test getting observation
-            sim.step(random.choice(list(hab_cfg.agents[0].action_space.keys())))
+            sim.step(actions[step])
 
             # check that time is increasing in the world
             assert sim.get_world_time() > prev_time
@@ -296,7 +315,7 @@ def test_dynamics():
         obj_template_mgr = sim.get_object_template_manager()
         obj_template_mgr.load_configs("data/objects/example_objects/", True)
         # make the simulation deterministic (C++ seed is set in reconfigure)
-        np.random.seed(cfg_settings["seed"])  # type: ignore[arg-type]
+        rng = np.random.default_rng(cfg_settings["seed"])  # type: ignore[arg-type]
         assert obj_template_mgr.get_num_templates() > 0
         # get the rigid object manager, which provides direct
         # access to objects
@@ -330,58 +349,71 @@ def test_dynamics():
             object1_init_template = cheezit_box1.creation_attributes
             object1_mass = object1_init_template.mass
             grav = sim.get_gravity()
-            previous_object_states = [
-                [cheezit_box1.translation, cheezit_box1.rotation],
-                [cheezit_box2.translation, cheezit_box2.rotation],
-            ]
+            # object positions are kept as one (2, 3) array so that both objects
+            # can be checked with a single isclose call per step
+            boxes = (cheezit_box1, cheezit_box2)
+            previous_positions = np.array([box.translation for box in boxes])
+            previous_rotations = [box.rotation for box in boxes]
             prev_time = sim.get_world_time()
-            for _ in range(50):
+            # draw all random forces, application points and torques up front, in
+            # the single precision the bindings convert them to
+            num_steps = 50
+            forces = rng.random((num_steps, 3), dtype=np.float32)
+            force_positions = rng.random((num_steps, 3), dtype=np.float32)
+            torques = rng.random((num_steps, 3), dtype=np.float32)
+            # TODO: expose object properties (such as mass) to python
+            # Counter the force of gravity on the object (it should not translate)
+            anti_gravity_force = -grav * object1_mass
+            object_origin = mn.Vector3()
+            action_names = tuple(hab_cfg.agents[0].action_space.keys())
+            actions = random.choices(action_names, k=num_steps)
+            for step in range(num_steps):
                 # force application at a location other than the origin should always cause angular and linear motion
-                cheezit_box2.apply_force(np.random.rand(3), np.random.rand(3))
+                cheezit_box2.apply_force(forces[step], force_positions[step])
 
-                # TODO: expose object properties (such as mass) to python
-                # Counter the force of gravity on the object (it should not translate)
-                cheezit_box1.apply_force(-grav * object1_mass, np.zeros(3))
+                cheezit_box1.apply_force(anti_gravity_force, object_origin)
 
                 # apply torque to the "floating" object. It should rotate, but not translate
-                cheezit_box1.apply_torque(np.random.rand(3))
+                cheezit_box1.apply_torque(torques[step])
 
                 # TODO: test other physics functions
 
                 # test getting observation
-                sim.step(random.choice(list(hab_cfg.agents[0].action_space.keys())))
+                sim.step(actions[step])
 
                 # check that time is increasing in the world
                 assert sim.get_world_time() > prev_time
                 prev_time = sim.get_world_time()
 
+                # query each object's state once per step and reuse it as the
+                # previous state for the next step
+                current_positions = np.array([box.translation for box in boxes])
+                current_rotations = [box.rotation for box in boxes]
+                stationary = np.isclose(previous_positions, current_positions).all(
+                    axis=1
+                )
+
                 # check the object states
                 # 1st object should rotate, but not translate
-                assert np.allclose(
-                    previous_object_states[0][0], cheezit_box1.translation
-                )
-                assert previous_object_states[0][1] != cheezit_box1.rotation
+                assert stationary[0]
+                assert previous_rotations[0] != current_rotations[0]
 
                 # 2nd object should rotate and translate
-                assert not np.allclose(
-                    previous_object_states[1][0], cheezit_box2.translation
-                )
-                assert previous_object_states[1][1] != cheezit_box2.rotation
+                assert not stationary[1]
+                assert previous_rotations[1] != current_rotations[1]
 
-                previous_object_states = [
-                    [cheezit_box1.translation, cheezit_box1.rotation],
-                    [cheezit_box2.translation, cheezit_box2.rotation],
-                ]
+                previous_positions = current_positions
+                previous_rotations = current_rotations
 
             # test setting DYNAMIC object to KINEMATIC
             cheezit_box2.motion_type = habitat_sim.physics.MotionType.KINEMATIC
             assert cheezit_box2.motion_type == habitat_sim.physics.MotionType.KINEMATIC
 
-            sim.step(random.choice(list(hab_cfg.agents[0].action_space.keys())))
+            sim.step(random.choice(action_names))
 
             # 2nd object should no longer rotate or translate
-            assert np.allclose(previous_object_states[1][0], cheezit_box2.translation)
-            assert previous_object_states[1][1] == cheezit_box2.rotation
+            assert np.allclose(previous_positions[1], cheezit_box2.translation)
+            assert previous_rotations[1] == cheezit_box2.rotation
 
             sim.step_physics(0.1)
 
@@ -471,9 +503,8 @@ def test_velocity_control():
             vel_control.controlling_lin_vel = True
             vel_control.controlling_ang_vel = True
 
-            while sim.get_world_time() < 1.0 + cur_time:
-                # NOTE: stepping close to default timestep to get near-constant velocity control of DYNAMIC bodies.
-                sim.step_physics(0.00416)
+            # NOTE: stepping close to default timestep to get near-constant velocity control of DYNAMIC bodies.
+            sim.step_physics_until(1.0 + cur_time, 0.00416)
 
             ground_truth_pos = (
                 sim.get_world_time() - cur_time
@@ -494,9 +525,8 @@ def test_velocity_control():
             box_object.translation = [0.0, 0.0, 0.0]
             box_object.rotation = mn.Quaternion()
 
-            while sim.get_world_time() < 0.5 + cur_time:
-                # NOTE: stepping close to default timestep to get near-constant velocity control of DYNAMIC bodies.
-                sim.step_physics(0.008)
+            # NOTE: stepping close to default timestep to get near-constant velocity control of DYNAMIC bodies.
+            sim.step_physics_until(0.5 + cur_time, 0.008)
 
             # NOTE: explicit integration, so expect some error
             ground_truth_q = mn.Quaternion([[1.0, 0.0, 0.0], 0.0])
@@ -509,6 +539,29 @@ def test_velocity_control():
             rigid_obj_mgr.remove_object_by_id(box_object.object_id)
 
 
+@pytest.mark.parametrize("enable_physics", [True, False])
+def test_step_physics_until(enable_physics):
+    if enable_physics and not habitat_sim.bindings.built_with_bullet:
+        pytest.skip("Bullet physics not available")
+    cfg_settings = habitat_sim.utils.settings.default_sim_settings.copy()
+    cfg_settings["scene"] = "NONE"
+    cfg_settings["enable_physics"] = enable_physics
+    hab_cfg = habitat_sim.utils.settings.make_cfg(cfg_settings)
+    with habitat_sim.Simulator(hab_cfg) as sim:
+        fixed_time_step = sim.get_physics_time_step()
+        start_time = sim.get_world_time()
+        target_time = start_time + 0.5
+
+        # steps smaller than the fixed timestep may individually leave the world
+        # time unchanged, which must not end the loop early
+        world_time = sim.step_physics_until(target_time, fixed_time_step / 2)
+        assert world_time == sim.get_world_time()
+        assert target_time <= world_time < target_time + fixed_time_step + 1e-6
+
+        # target already reached, so nothing is stepped
+        assert sim.step_physics_until(start_time, fixed_time_step / 2) == world_time
+
+
 @pytest.mark.skipif(
     not osp.exists("data/scene_datasets/habitat-test-scenes/apartment_1.glb"),
     reason="Requires the habitat-test-scenes",
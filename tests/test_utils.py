@@ -4,8 +4,17 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import numpy as np
+
 from habitat_sim.utils.collect_env import main as collect_env
+from habitat_sim.utils.viz_utils import depth_to_rgb
 
 
 def test_collect_env():
     collect_env()
+
+
+def test_depth_to_rgb_saturates():
+    # 255 / 7 is not exact in float32, clipped pixels must still map to 255
+    depth = np.linspace(0.0, 12.0, 4 * 5, dtype=np.float32).reshape(4, 5)
+    assert depth_to_rgb(depth, clip_max=7.0).max() == 255